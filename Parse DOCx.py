@@ -1,7 +1,12 @@
 from classes.ms_word import Docx
 from functions.ms_word_menu import docx_menu
 from functions.Display_Output import output_menu
+from collections import deque
 from colorama import just_fix_windows_console
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import freeze_support
+import os
 import pandas as pd
 import re
 from sys import exit
@@ -115,9 +120,13 @@ def process_docx(filename):
 
     write_log(f'{filename.__str__()}\n')
 
+    for warning in filename.warnings:  # warnings found when the file was loaded, possibly in a worker process.
+        print(f'{red}{warning}{white}')
+        write_log(f'**Warning: {warning}\n')
+
     for checkFile in ("word/settings.xml", "docProps/core.xml", "docProps/app.xml"):  # checks if xml files being parsed
         # are present and notes same in the log file.
-        xml_exists = checkFile in filename.xml_files().keys()
+        xml_exists = filename.xml_exists(checkFile)
         write_log(f'**{checkFile} exists? {xml_exists}\n')
 
     # Writing document summary worksheet.
@@ -274,6 +283,22 @@ def process_docx(filename):
     return
 
 
+def load_docx(docx_file, triage_mode, hash_files):
+    """
+    Runs in a worker process, so that several DOCx files are parsed at the same time. The DOCx file itself is hashed
+    here too, and the Docx keeps the hash.
+    When not in triage mode, it also reads (and hashes) the files in the archive, which the Docx keeps, so that
+    process_docx doesn't have to do it in the main process. The DOCx files are already spread over one process per
+    CPU, so the Docx's optional thread pool for hashing the archive files is left off.
+    :return: the Docx object, which is sent back to the main process.
+    """
+    docx = Docx(docx_file, triage_mode, hash_files)
+    docx.hash()
+    if not triage_mode:
+        docx.xml_files()
+    return docx
+
+
 def write_log(text):
     """
     Write to log file
@@ -302,7 +327,14 @@ def write_error_log(text):
 
 if __name__ == "__main__":
 
-    process_or_cancel, logFile, errorLog, processingOption, hashFiles, excel_file_path, msword_file_path = docx_menu()
+    freeze_support()  # needed for the worker processes when run as a Windows executable
+
+    menu_selection = docx_menu()
+    process_or_cancel = menu_selection.clicked_button
+    logFile = menu_selection.log_file
+    errorLog = menu_selection.error_log_file
+    hashFiles = menu_selection.hash_files
+    excel_file_path = menu_selection.excel_file
 
     if process_or_cancel == "CANCEL":
         print(f'You clicked on {red}CANCEL{white}.')
@@ -313,10 +345,11 @@ if __name__ == "__main__":
         input(f'Press {green}ENTER{white} to exit script.')
         exit()
 
-    if processingOption == "triage":
+    if menu_selection.processing_option == "triage":
         triage = True
 
-    docxPath = msword_file_path[0][0:msword_file_path[0].rindex("/") + 1]  # extract path of DOCx file(s) to process
+    first_docx = menu_selection.docx_paths[0]
+    docxPath = first_docx[0:first_docx.rindex("/") + 1]  # extract path of DOCx file(s) to process
 
     logFilesPath = (excel_file_path[0:excel_file_path.rindex("/") + 1])
     logFile = (logFilesPath + logFile)
@@ -333,47 +366,62 @@ if __name__ == "__main__":
     if not re.search(r'\.xlsx$', excel_file_path):  # if .xlsx was not included in file name, add it.
         excel_file_path += ".xlsx"
 
-    for f in msword_file_path:  # loop over the files selected, processing each.
-        print(f'\nProcessing {green}"{f}"{white}')
-        try:
-            process_docx(Docx(f, triage, hashFiles))
-
-        except Exception as docxError:  # If processing a DOCx file raises an error, let the user know, and write it
-            # to the error log.
-            docxErrorCount += 1  # increment error count by 1.
-            filesUnableToProcess.append(f)
-            print(f'{red}error processing {f}. {white}Skipping.')
-            write_error_log(f'Error trying to process {f}. Skipping.\n'
-                            f'Error: {docxError}\n')
-        print(f'Finished processing {green}"{f}"{white}. ')
-
-    df = pd.DataFrame(data=doc_summary_worksheet)
-
-    df.to_excel(excel_writer=excel_file_path, sheet_name="Doc_Summary", index=False)
-
-    write_log(f'"Doc_Summary" worksheet written to Excel file.\n\n')
-
-    df = pd.DataFrame(data=metadata_worksheet)
+    workers = min(os.cpu_count() or 1, 61)  # Windows doesn't allow more than 61 worker processes
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # The DOCx files are parsed in worker processes at the same time, but processed here one at a time in the
+        # order they were selected, so the log and the worksheets are in the same order as before. Only twice as many
+        # files as there are workers are loading at any time, so that all the parsed files aren't kept in memory.
+        docx_files = menu_selection.files()
+        loading_docx = deque((f, executor.submit(load_docx, f, triage, hashFiles))
+                             for f in islice(docx_files, 2 * workers))
+
+        while loading_docx:  # loop over the files selected, processing each.
+            f, loaded_docx = loading_docx.popleft()
+            next_file = next(docx_files, None)
+            if next_file is not None:  # start loading the next file while this one is processed.
+                loading_docx.append((next_file, executor.submit(load_docx, next_file, triage, hashFiles)))
+
+            print(f'\nProcessing {green}"{f}"{white}')
+            try:
+                process_docx(loaded_docx.result())
+
+            except Exception as docxError:  # If processing a DOCx file raises an error, let the user know, and write
+                # it to the error log.
+                docxErrorCount += 1  # increment error count by 1.
+                filesUnableToProcess.append(f)
+                print(f'{red}error processing {f}. {white}Skipping.')
+                write_error_log(f'Error trying to process {f}. Skipping.\n'
+                                f'Error: {docxError}\n')
+            del loaded_docx  # the Docx is no longer needed once it's processed
+            print(f'Finished processing {green}"{f}"{white}. ')
+
+    # All the worksheets are written with one writer, so the Excel file is only written once rather than reloaded
+    # and saved again for each worksheet.
+    with pd.ExcelWriter(path=excel_file_path, engine='openpyxl') as writer:
+        df = pd.DataFrame(data=doc_summary_worksheet)
+
+        df.to_excel(excel_writer=writer, sheet_name="Doc_Summary", index=False)
+
+        write_log(f'"Doc_Summary" worksheet written to Excel file.\n\n')
+
+        df = pd.DataFrame(data=metadata_worksheet)
 
-    with pd.ExcelWriter(path=excel_file_path, engine='openpyxl', mode='a') as writer:
         df.to_excel(excel_writer=writer, sheet_name="metadata", index=False)
 
-    write_log(f'"Metadata" worksheet written to Excel.\n\n')
+        write_log(f'"Metadata" worksheet written to Excel.\n\n')
 
-    if not triage:
-        df = pd.DataFrame(data=archive_files_worksheet)
+        if not triage:
+            df = pd.DataFrame(data=archive_files_worksheet)
 
-        with pd.ExcelWriter(path=excel_file_path, engine='openpyxl', mode='a') as writer:
             df.to_excel(excel_writer=writer, sheet_name="Archive Files", index=False)
 
-        write_log(f'"Archive Files" worksheet written to Excel.\n\n')
+            write_log(f'"Archive Files" worksheet written to Excel.\n\n')
 
-        df = pd.DataFrame(data=rsids_worksheet)
+            df = pd.DataFrame(data=rsids_worksheet)
 
-        with pd.ExcelWriter(path=excel_file_path, engine='openpyxl', mode='a') as writer:
             df.to_excel(excel_writer=writer, sheet_name="RSIDs", index=False)
 
-        write_log(f'"RSIDs" worksheet written to Excel.\n\n')
+            write_log(f'"RSIDs" worksheet written to Excel.\n\n')
 
     script_end = time.strftime("%Y-%m-%d_%H:%M:%S")
 
@@ -382,7 +430,7 @@ if __name__ == "__main__":
     else:
         errorFile = "nil - no errors"
 
-    output_menu(log_file=logFile, error_log_file=errorFile, folder=docxPath, file_count=len(msword_file_path),
+    output_menu(log_file=logFile, error_log_file=errorFile, folder=docxPath, file_count=menu_selection.n_files,
                 file_error_count=docxErrorCount, excel_file=excel_file_path,
                 start_time=script_start, end_time=script_end)
 
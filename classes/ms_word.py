@@ -1,8 +1,64 @@
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import os
 import re
+import struct
+from xml.etree import ElementTree
 import zipfile
 
 
+# The patterns are compiled once when the module is imported rather than each time a method is called.
+
+# RSIDs in settings.xml
+_RSID_RE = re.compile(r'<w:rsid w:val="([0-9A-F]{8})" ?/>')
+_RSID_ROOT_RE = re.compile(r'<w:rsidRoot w:val="([^"]*)"')
+
+# tags and their attributes in document.xml, which is searched as bytes rather than decoded
+# <w:p> and <w:p ...> paragraph, <w:r> and <w:r ...> run, and <w:t> and <w:t? ...> text tags
+_TAG_RE = re.compile(rb'<w:[pr](?:>| [^>]*/?>)|<w:t(?:>|.? [^>]*/?>)')
+_PARA_ID_RE = re.compile(rb'paraId="([0-9A-F]{8})"')
+_TEXT_ID_RE = re.compile(rb'textId="([0-9A-F]{8})"')
+# rsidR, rsidRPr, rsidP and rsidRDefault attributes, captured as (rsid type, RSID value)
+_RSID_VALUE_RE = re.compile(rb'w:(rsidR|rsidRPr|rsidP|rsidRDefault)="([0-9A-F]{8})"')
+
+
+def _metadata_re(name):
+    """
+    :param name: the name of a metadata element in core.xml or app.xml, without its namespace (e.g. "title")
+    :return: compiled pattern that captures the text of that element, e.g. <dc:title>...</dc:title>
+    """
+    return re.compile(rf'<.{{0,2}}:?{name}>(.*?)</.{{0,2}}:?{name}>')
+
+
+# metadata elements in core.xml and app.xml, searched for in the text of the file when it isn't valid XML.
+# The created and modified dates have an xsi:type attribute, so they are matched with their own pattern.
+_CORE_METADATA_RE = {name: _metadata_re(name) for name in
+                     ["title", "subject", "creator", "keywords", "description", "revision", "lastModifiedBy",
+                      "lastPrinted", "category", "contentStatus"]}
+_CORE_METADATA_RE["created"] = re.compile(r'<dcterms:created[^>].*?>(.*?)</dcterms:created>')
+_CORE_METADATA_RE["modified"] = re.compile(r'<dcterms:modified[^>].*?>(.*?)</dcterms:modified>')
+_APP_METADATA_RE = {name: _metadata_re(name) for name in
+                    ["Template", "TotalTime", "Pages", "Words", "Characters", "Application", "DocSecurity", "Lines",
+                     "Paragraphs", "CharactersWithSpaces", "AppVersion", "Manager", "Company"]}
+
+
+def _decode_keys(counter):
+    """
+    :param counter: Counter with bytes keys (e.g. RSIDs found in document.xml)
+    :return: a Counter with the same counts, and the keys decoded to strings
+    """
+    return Counter({key.decode("ascii"): count for key, count in counter.items()})
+
+
+# information on one file in the archive, as returned by Docx.xml_files(). It can also be indexed like a list.
+XmlFileInfo = namedtuple("XmlFileInfo", ["md5", "modified", "size", "compress_type", "create_system",
+                                         "create_version", "extract_version", "flag_bits", "extra_len",
+                                         "extra_chars"])
+# extra field of a local file header in the archive: its length in bytes, and its first bytes in hex as text
+ExtraField = namedtuple("ExtraField", ["length", "values"])
+
+
 class Docx:
     """
     Accepts a docx file. Has the following methods to extract data from core.xml, app.xml, document.xml
@@ -10,10 +66,10 @@ class Docx:
     app_version, application, category, characters, characters_with_spaces, company, content_status, created, creator,
     description, filename, keywords, last_modified_by, last_printed, lines, manager, modified, pages, paragraph_tags,
     paragraphs, revision, runs_tags, security, subject, template, text_tags, title, total_editing_time, words,
-    xml_files, xml_hash, xml_size
+    xml_crcs, xml_exists, xml_files, xml_hash, xml_size
     """
 
-    def __init__(self, msword_file, triage=False, hashing=True):
+    def __init__(self, msword_file, triage=False, hashing=True, hash_workers=1):
         """
         .docx file to pass to the class
         Triage value can be True or False. If True, will parse less info to execute faster.
@@ -22,64 +78,61 @@ class Docx:
         The script using this class still ultimately decides what methods it wants to use.
         But if in triage mode, some of the variables will not get assigned any value, thus
         will affect any methods that rely on those variables having a value assigned to them.
+        hash_workers is the most threads xml_files() uses to hash the files in the archive. By default (1), they are
+        hashed in the calling thread. A higher value is only worth it for an archive with many large files, when
+        DOCx files aren't already being processed in parallel.
+        Warnings about the file (e.g. an XML file missing from the archive) are not printed, but added to the list
+        self.warnings, so that the script using this class can print and log them with the rest of that file's output.
         """
         self.red = f'\033[91m'
         self.white = f'\033[00m'
         self.green = f'\033[92m'
         self.msword_file = msword_file
         self.hashing = hashing
-        self.header_offsets, self.binary_content = self.__find_binary_string()
-        self.extra_fields = self.__xml_extra_bytes()
+        self.hash_workers = hash_workers
+        self._xml_files = None  # filled in by the first call to xml_files()
+        self._hash = None  # filled in by the first call to hash()
+        self.warnings = []  # warnings about this file, in the order they were found
         self.core_xml_file = "docProps/core.xml"
-        self.core_xml_content = self.__load_core_xml()
         self.app_xml_file = "docProps/app.xml"
-        self.app_xml_content = self.__load_app_xml()
         self.document_xml_file = "word/document.xml"
-        self.document_xml_content = self.__load_document_xml()
         self.settings_xml_file = "word/settings.xml"
-        self.settings_xml_content = self.__load_settings_xml()
+        with zipfile.ZipFile(self.msword_file, 'r') as zipref:  # the archive is opened once to load all the XML files
+            self._namelist = set(zipref.namelist())  # names of the files in the archive
+            # offset of the local file header of each file, from the central directory at the end of the archive
+            self.header_offsets = [file_info.header_offset for file_info in zipref.infolist()]
+            self.core_xml_content = self.__load_xml(zipref, self.core_xml_file)
+            self.app_xml_content = self.__load_xml(zipref, self.app_xml_file)
+            document_xml_content = self.__load_xml(zipref, self.document_xml_file, decode=False)
+            self.settings_xml_content = self.__load_xml(zipref, self.settings_xml_file)
+        with open(self.msword_file, 'rb') as msword_binary:  # only the local file headers are read
+            self.extra_fields = self.__xml_extra_bytes(msword_binary)
+        self.core_metadata = self.__xml_metadata(self.core_xml_content, self.core_xml_file, _CORE_METADATA_RE)
+        self.app_metadata = self.__xml_metadata(self.app_xml_content, self.app_xml_file, _APP_METADATA_RE)
         self.rsidRs = self.__extract_all_rsidr_from_summary_xml()
 
-        self.p_tags = re.findall(r'<w:p>|<w:p [^>]*/?>', self.document_xml_content)
-        self.r_tags = re.findall(r'<w:r>|<w:r [^>]*/?>', self.document_xml_content)
-        self.t_tags = re.findall(r'<w:t>|<w:t.? [^>]*/?>', self.document_xml_content)
+        # document.xml is only kept for as long as it takes to go through its tags. The tags themselves aren't kept,
+        # only their counts.
+        self.tag_counts, rsids, para_ids, text_ids = self.__count_tags(document_xml_content, triage)
+        del document_xml_content
 
         if not triage:  # if not run in triage mode, do full parsing
 
-            self.rsidR_in_document_xml = self.__rsidr_in_document_xml()
-            self.rsidRPr = self.__other_rsids_in_document_xml("rsidRPr")
-            self.rsidP = self.__other_rsids_in_document_xml("rsidP")
-            self.rsidRDefault = self.__other_rsids_in_document_xml("rsidRDefault")
-
-            self.para_id = self.__para_id_tags__()
-            self.text_id = self.__text_id_tags__()
-
-    def __find_binary_string(self):
-
-        pkzip_header = "504B0304"  # hex values for signature of a zip file in the archive.
-
-        with open(self.msword_file, 'rb') as msword_binary:  # read the file as binary
-            content = msword_binary.read()
+            # rsidR count for each RSID in settings.xml, including those that aren't in document.xml
+            self.rsidR_in_document_xml = {rsid: rsids["rsidR"][rsid] for rsid in self.rsidRs}
+            self.rsidRPr = dict(rsids["rsidRPr"])
+            self.rsidP = dict(rsids["rsidP"])
+            self.rsidRDefault = dict(rsids["rsidRDefault"])
 
-        target_bytes = bytes.fromhex(pkzip_header)  # convert from hex to bytes
+            self.para_id, self.text_id = dict(para_ids), dict(text_ids)
 
-        matches = []  # list of offsets where header is found
-        index = 0
-
-        while index < len(content):  # iterate over the list
-            index = content.find(target_bytes, index)  # search for
-            if index == -1:  # no more items in the list.
-                break
-            matches.append(index)
-            index += 1
-
-        return matches, content  # returns the list of offsets of each header, and the binary file.
-
-    def __xml_extra_bytes(self):
+    def __xml_extra_bytes(self, msword_binary):
         """
         ref: https://en.wikipedia.org/wiki/ZIP_(file_format)#Local_file_header
 
-        return: list [xml file name, # of bytes in extra field, truncated bytes]
+        :param msword_binary: the DOCx file, opened as binary by __init__
+
+        return: dictionary {xml file name: ExtraField(# of bytes in extra field, truncated bytes)}
         """
         zip_header = {"signature": [0, 4],  # byte 0 for 4 bytes
                       "extract version": [4, 2],  # byte 4 for 2 bytes
@@ -102,89 +155,108 @@ class Docx:
 
         for offset in self.header_offsets:
 
-            filename_len = int.from_bytes(self.binary_content[
-                                          zip_header["filename length"][0] + offset:
-                                          zip_header["filename length"][1] + offset +
-                                          zip_header["filename length"][0]],
-                                          "little")
-
-            filename_start = offset + 30
-            filename_end = offset + 30 + filename_len
+            msword_binary.seek(offset)  # goes to the header rather than reading the whole file
+            header = msword_binary.read(30)  # fixed size part of the header, up to the extra field length
 
-            filename = self.binary_content[filename_start:filename_end].decode('ascii')  # decode filename as ASCII
+            # filename length and extra field length are consecutive 2-byte little endien values
+            filename_len, extrafield_len = struct.unpack_from("<HH", header, zip_header["filename length"][0])
 
-            extrafield_len = int.from_bytes(self.binary_content[
-                                            zip_header["extra field length"][0] + offset:
-                                            zip_header["extra field length"][1] + offset +
-                                            zip_header["extra field length"][0]],
-                                            "little")  # getting binary value, little endien
-
-            extrafield_start = filename_end
-            extrafield_end = extrafield_start + extrafield_len
-
-            extrafield = self.binary_content[extrafield_start:extrafield_end]
-
-            extrafield_hex_as_text = []  # List that will contain the extra characters represented as text.
-
-            for h in extrafield:
-                extrafield_hex_as_text.append(str(hex(h)))
+            filename = msword_binary.read(filename_len).decode('ascii')  # decode filename as ASCII
 
             if extrafield_len == 0:  # many are 0 bytes, so skipping those.
-                extras[filename] = [extrafield_len, "nil"]
+                extras[filename] = ExtraField(extrafield_len, "nil")
             else:
-                if extrafield_len <= truncate_extra_field:  # field size larger than truncate value
-                    extras[filename] = [extrafield_len, extrafield_hex_as_text]
-                else:
-                    extras[filename] = [extrafield_len, extrafield_hex_as_text[0:truncate_extra_field]]  # adds only
-                    # the select # of characters as specified in the variable truncate_extra_field. This is so that
-                    # we don't end up with hundreds of characters in a cell in Excel, as some extra fields can be
-                    # several hundred values long. But so far, most are 0x00, with only the first few being values other
-                    # than hex 0x00.
+                # Only the first bytes of the extra field, as specified in the variable truncate_extra_field, are
+                # read. This is so that we don't end up with hundreds of characters in a cell in Excel, as some extra
+                # fields can be several hundred values long. But so far, most are 0x00, with only the first few being
+                # values other than hex 0x00.
+                extrafield = msword_binary.read(min(extrafield_len, truncate_extra_field))  # follows the filename
+                extras[filename] = ExtraField(extrafield_len, [hex(h) for h in extrafield])  # characters as text
 
         return extras
 
-    def __load_core_xml(self):
-        # load core.xml
-        if self.core_xml_file in self.xml_files():  # if the file exists, read it and return its content
-            with zipfile.ZipFile(self.msword_file, 'r') as zipref:
-                with zipref.open(self.core_xml_file) as xmlFile:
-                    return xmlFile.read().decode("utf-8")
-        else:  # if it doesn't exist, return an empty string.
-            print(f'{self.red}"{self.core_xml_file}" does not exist{self.white} in "{self.filename()}". '
-                  f'Returning empty string.')
-            return ""
-
-    def __load_app_xml(self):
-        # load app.xml
-        if self.app_xml_file in self.xml_files():  # if the file exists, read it and return its content
-            with zipfile.ZipFile(self.msword_file, 'r') as zipref:
-                with zipref.open(self.app_xml_file) as xmlFile:
-                    return xmlFile.read().decode("utf-8")
-        else:  # if it doesn't exist, return an empty string.
-            print(f'{self.red}"{self.app_xml_file}" does not exist{self.white} in "{self.filename()}". '
-                  f'Returning empty string.')
-            return ""
-
-    def __load_document_xml(self):
-        # load document.xml
-        if self.document_xml_file in self.xml_files():  # if the file exists, read it and return its content
-            with zipfile.ZipFile(self.msword_file, 'r') as zipref:
-                with zipref.open(self.document_xml_file) as xmlFile:
-                    return xmlFile.read().decode("utf-8")
+    def __load_xml(self, zipref, xml_file, decode=True):
+        """
+        :param zipref: the DOCx archive, already opened by __init__
+        :param xml_file: the name of the XML file in the archive (e.g. "docProps/core.xml")
+        :param decode: if False, the content is returned as bytes rather than decoded as UTF-8
+        :return: the content of the XML file, or an empty string if it doesn't exist in the archive
+        """
+        if xml_file in self._namelist:  # if the file exists, read it and return its content
+            content = zipref.read(xml_file)
+            return content.decode("utf-8") if decode else content
         else:  # if it doesn't exist, return an empty string.
-            print(f'{self.red}"{self.document_xml_file}" does not exist{self.white} in "{self.filename()}". '
-                  f'Returning empty string.')
-            return ""
-
-    def __load_settings_xml(self):
-        if self.settings_xml_file in self.xml_files():  # if the file exists, read it and return its content
-            with zipfile.ZipFile(self.msword_file, 'r') as zipref:
-                with zipref.open(self.settings_xml_file) as xmlFile:
-                    return xmlFile.read().decode("utf-8")
-        else:
-            print(f'{self.red}"{self.settings_xml_file}" does not exist{self.white} in "{self.filename()}". '
-                  f'Returning empty string.')
-            return ""
+            self.warnings.append(f'"{xml_file}" does not exist in "{self.filename()}". Returning empty string.')
+            return "" if decode else b""
+
+    def __xml_metadata(self, xml_content, xml_file, fallback_patterns):
+        """
+        Parses core.xml or app.xml once so that each metadata method is a dictionary lookup.
+        If the file isn't valid XML (e.g. a malformed or tampered document), each metadata element is searched for in
+        its text instead, as the metadata methods used to do, so that it's still reported.
+        :param xml_content: the content of the XML file
+        :param xml_file: the name of the XML file in the archive, for the error message
+        :param fallback_patterns: dictionary {element name: compiled pattern capturing its text} used if it can't be
+        parsed
+        :return: dictionary {element name without its namespace (e.g. "title" for <dc:title>): text of the element}
+        """
+        metadata = {}
+        if xml_content == "":  # the file doesn't exist in the archive
+            return metadata
+        try:
+            root = ElementTree.fromstring(xml_content)
+        except ElementTree.ParseError as parse_error:
+            self.warnings.append(f'"{xml_file}" could not be parsed in "{self.filename()}" ({parse_error}). '
+                                 f'Searching its text for the metadata instead.')
+            for name, pattern in fallback_patterns.items():
+                match = pattern.search(xml_content)
+                if match is not None:
+                    metadata[name] = match.group(1)
+            return metadata
+        for element in root.iter():
+            name = element.tag.rsplit("}", 1)[-1]  # "{namespace}title" -> "title"
+            metadata.setdefault(name, element.text or "")  # keeps the first one if a name is repeated
+        return metadata
+
+    def __count_tags(self, document_xml_content, triage):
+        """
+        Goes through the paragraph, runs and text tags in document.xml in a single pass over it, counting the tags.
+        When not in triage mode, it also counts the rsidR, rsidRPr, rsidP and rsidRDefault values in those tags, and
+        the paraId and textId values in the <w:p> paragraph tags, at the same time.
+        :param document_xml_content: the content of document.xml, as bytes
+        :param triage: if True, only the tags are counted
+        :return: Counter of the tags by kind ("p", "r" or "t"),
+        dictionary where the key is the rsid type and the value is a Counter of each unique RSID of that type
+        (e.g. {"rsidR": Counter({"00123456": 4, "00345678": 11}), "rsidRPr": Counter({...}), ...}),
+        Counter of each unique paraId and Counter of each unique textId
+        """
+        tag_counts = Counter()
+        rsids = {b"rsidR": Counter(), b"rsidRPr": Counter(), b"rsidP": Counter(), b"rsidRDefault": Counter()}
+        para_ids = Counter()
+        text_ids = Counter()
+
+        for tag in _TAG_RE.findall(document_xml_content):
+            kind = tag[3:4]  # the letter after "<w:" tells which kind of tag it is
+            tag_counts[kind] += 1
+            if triage:
+                continue
+
+            for rsid_type, rsid in _RSID_VALUE_RE.findall(tag):
+                rsids[rsid_type][rsid] += 1
+
+            if kind == b"p":
+                para_id = _PARA_ID_RE.search(tag)
+                if para_id:  # no match if there is no paraId= in this <w:p> paragraph tag.
+                    para_ids[para_id.group(1)] += 1
+                text_id = _TEXT_ID_RE.search(tag)
+                if text_id:  # no match if there is no textId= in this <w:p> paragraph tag.
+                    text_ids[text_id.group(1)] += 1
+
+        # the values are decoded once each here, rather than for every match
+        return (_decode_keys(tag_counts),
+                {rsid_type.decode("ascii"): _decode_keys(rsid_counts) for rsid_type, rsid_counts in rsids.items()},
+                _decode_keys(para_ids),
+                _decode_keys(text_ids))
 
     def __extract_all_rsidr_from_summary_xml(self):
         """
@@ -192,105 +264,11 @@ class Docx:
         it would have to do this every time you called the method.
         :return:
         """
-        rsids_list = []
         # Find all RSIDs, not rsidRoot. rsidRoot is repeated in rsids.
-        matches = re.findall(r'<w:rsid w:val="[0-9A-F]{8}" ?/>', self.settings_xml_content)
-
-        for match in matches:  # loops through all matches
-            # greps for rsid using a group to extract the actual RSID from the string.
-            rsid_match = re.search(r'<w:rsid w:val="([0-9A-F]{8})"', match)
-            if rsid_match:
-                rsids_list.append(rsid_match.group(1))  # Appends it to the list
+        # The pattern has a group, so findall returns the RSIDs themselves rather than the whole tags.
+        rsids_list = _RSID_RE.findall(self.settings_xml_content)
         return "" if len(rsids_list) == 0 else rsids_list
 
-    def __rsidr_in_document_xml(self):
-        """
-        This function calculates the count of each rsidR in document.xml
-        It searches the previously extracted tags rather than the full document.
-        :return:
-        """
-        rsidr_count = {}
-        for rsid in self.rsidRs:
-            pattern = re.compile(rf'w:rsidR="{rsid}"')
-
-            count_rsids = 0
-
-            count_rsids += len(re.findall(pattern, ",".join(self.p_tags)))
-            count_rsids += len(re.findall(pattern, ",".join(self.r_tags)))
-            count_rsids += len(re.findall(pattern, ",".join(self.t_tags)))
-
-            rsidr_count[rsid] = count_rsids
-
-        return rsidr_count
-
-    def __other_rsids_in_document_xml(self, rsid):
-        """
-        :param rsid tag name (e.g. "rsidRPr", "rsidP", "rsidRDefault")
-        The function accepts an rsid tag name as a parameter (e.g. rsidRPr, rsidP, rsidDefault).
-        It searches document.xml for a pattern to find all instances of that rsid tag.
-        It creates a dictionary that contains each unique rsid value as the key, and the count of how many times
-        that rsid is in document.xml.
-        E.g., {"00123456": 4, "00234567": 0, "00345678":11}
-
-        :return: dictionary where the key is unique RSIDs, and the value is a count of the occurrences of that rsid
-        in document.xml
-        """
-        rsids = {}
-        pattern = re.compile('w:' + rsid + '="[0-9A-F]{8}"')
-        # Find all rsid types passed to the function (rsidRPr, rsidP, rsidRDefault in document.xml file
-
-        matches = re.findall(pattern, ",".join(self.p_tags))  # searches p_tags
-        matches += re.findall(pattern, ",".join(self.r_tags))  # searches r_tags
-        matches += re.findall(pattern, ",".join(self.t_tags))  # searches t_tags
-
-        for match in matches:  # loops through all matches
-            # greps for rsid using a group to extract the actual RSID from the string.
-            group_pattern = rf'w:' + rsid + '="([0-9A-F]{8})"'
-            rsid_match = re.search(group_pattern, match)
-            if rsid_match:
-                if rsid_match.group(1) in rsids:
-                    rsids[rsid_match.group(1)] += 1  # increment count by 1
-                else:
-                    rsids[rsid_match.group(1)] = 1  # Appends it to the list
-
-        return rsids
-
-    def __para_id_tags__(self):
-        """
-        :return: list of unique paraId tags and count in document.xml
-        """
-        pid_tags = {}  # empty dictionary to start
-
-        for pid_tag in self.p_tags:
-            pidtag = re.search(r'paraId="([0-9A-F]{8})"', pid_tag)
-            if pidtag is None:  # no paraId= tag in this <w:p> paragraph tag.
-                pass
-            else:
-                if pidtag.group(1) in pid_tags:
-                    pid_tags[pidtag.group(1)] += 1  # increment count by 1
-                else:
-                    pid_tags[pidtag.group(1)] = 1  # append to the list
-
-        return pid_tags
-
-    def __text_id_tags__(self):
-        """
-        :return: list of unique paraId tags and count in document.xml
-        """
-        text_tags = {}  # empty dictionary to start
-
-        for text_tag in self.p_tags:
-            texttag = re.search(r'textId="([0-9A-F]{8})"', text_tag)
-            if texttag is None:  # no paraId= tag in this <w:p> paragraph tag.
-                pass
-            else:
-                if texttag.group(1) in text_tags:
-                    text_tags[texttag.group(1)] += 1  # increment count by 1
-                else:
-                    text_tags[texttag.group(1)] = 1  # append to the list
-
-        return text_tags
-
     def filename(self):
         """
         :return: the filename of the DOCx file passed to the class
@@ -301,170 +279,209 @@ class Docx:
         """
         Function that will return the hash of the file itself
         """
-        if self.hashing:  # if hashing option was selected
-            filehash = hashlib.md5()
-            filehash.update(self.binary_content)
-            return filehash.hexdigest()
-        return ""  # if no hashing was selected.
+        if self._hash is None:  # only hashed once, then kept with the object
+            if self.hashing:  # if hashing option was selected
+                with open(self.msword_file, 'rb') as msword_binary:  # hashed in chunks rather than read all at once
+                    self._hash = hashlib.file_digest(msword_binary, "md5").hexdigest()
+            else:
+                self._hash = ""  # if no hashing was selected.
+        return self._hash
 
     def xml_files(self):
         """
         :return: A dictionary in the following format:
-        {XML filename: [file hash,
-                        modified date,
-                        file size,
-                        ZIP compression type,
-                        ZIP Create System,
-                        ZIP Created Version,
-                        ZIP Extract Version,
-                        ZIP Flag Bits (hex),
-                        ZIP extra values (hex as text)
+        {XML filename: XmlFileInfo(md5=file hash,
+                                   modified=modified date,
+                                   size=file size,
+                                   compress_type=ZIP compression type,
+                                   create_system=ZIP Create System,
+                                   create_version=ZIP Created Version,
+                                   extract_version=ZIP Extract Version,
+                                   flag_bits=ZIP Flag Bits (hex),
+                                   extra_len=ZIP extra field length,
+                                   extra_chars=ZIP extra values (hex as text))
         }
+        The archive is only read and hashed the first time this is called. Later calls return the same dictionary.
+        """
+        if self._xml_files is None:
+            self._xml_files = self.__xml_files_info()
+        return self._xml_files
+
+    def __xml_files_info(self):
+        """
+        Reads the information for each file in the archive, hashing each one if the hashing option was selected.
+        :return: the dictionary returned by xml_files()
         """
         month = {1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun",
                  7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec"}
         with zipfile.ZipFile(self.msword_file, 'r') as zip_file:
-            # returns XML files in the DOCx
-            xml_files = {}
-            for file_info in zip_file.infolist():
-                with zipfile.ZipFile(self.msword_file, 'r') as zip_ref:
-                    with zip_ref.open(file_info.filename) as xml_file:
-                        if self.hashing:  # if hashing option selected
-                            md5hash = hashlib.md5(xml_file.read()).hexdigest()
-                        else:
-                            md5hash = ""  # else return blank for hash value.
-
-                m_time = file_info.date_time
-                if m_time == (1980, 1, 1, 0, 0, 0):
-                    modified_time = "nil"
-                else:
-                    modified_time = str(m_time[0]) + "-" + month[m_time[1]] + "-" + str("%02d" % m_time[2]) + " " + str(
-                        "%02d" % m_time[3]) + ":" + str("%02d" % m_time[4]) + ":" + str("%02d" % m_time[5])
-
-                xml_files[file_info.filename] = [md5hash,
-                                                 modified_time,
-                                                 file_info.file_size,
-                                                 file_info.compress_type,
-                                                 file_info.create_system,
-                                                 file_info.create_version,
-                                                 file_info.extract_version,
-                                                 f"{file_info.flag_bits:#0{6}x}",
-                                                 self.extra_fields[file_info.filename][0],
-                                                 self.extra_fields[file_info.filename][1]
-                                                 ]
-            return xml_files  # returns dictionary {xml_filename: [file size, file hash]}
+            file_infos = zip_file.infolist()
+
+        md5hashes = [""] * len(file_infos)  # blank hash values if hashing option not selected
+        if self.hashing and file_infos:  # if hashing option selected
+            # If more than one hash worker was asked for, the files are hashed in parallel, as decompressing and
+            # hashing release the GIL. Each thread gets every nth file, and the hashes are put back in the same order
+            # as the files in the archive.
+            workers = min(self.hash_workers, os.cpu_count() or 1, len(file_infos))
+            if workers <= 1:  # no thread pool needed
+                md5hashes = self.__hash_archive_files(file_infos)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    hashes = executor.map(self.__hash_archive_files, [file_infos[n::workers] for n in range(workers)])
+                    for n, worker_hashes in enumerate(hashes):
+                        md5hashes[n::workers] = worker_hashes
+
+        # returns XML files in the DOCx
+        xml_files = {}
+        for file_info, md5hash in zip(file_infos, md5hashes):
+            m_time = file_info.date_time
+            if m_time == (1980, 1, 1, 0, 0, 0):
+                modified_time = "nil"
+            else:
+                modified_time = str(m_time[0]) + "-" + month[m_time[1]] + "-" + str("%02d" % m_time[2]) + " " + str(
+                    "%02d" % m_time[3]) + ":" + str("%02d" % m_time[4]) + ":" + str("%02d" % m_time[5])
+
+            xml_files[file_info.filename] = XmlFileInfo(md5hash,
+                                                        modified_time,
+                                                        file_info.file_size,
+                                                        file_info.compress_type,
+                                                        file_info.create_system,
+                                                        file_info.create_version,
+                                                        file_info.extract_version,
+                                                        f"{file_info.flag_bits:#0{6}x}",
+                                                        self.extra_fields[file_info.filename].length,
+                                                        self.extra_fields[file_info.filename].values
+                                                        )
+        return xml_files  # returns dictionary {xml_filename: XmlFileInfo}
+
+    def __hash_archive_files(self, file_infos):
+        """
+        Runs in a worker thread. ZipFile objects can't be shared between threads, so each call opens the archive.
+        :param file_infos: the ZipInfo of each file in the archive to hash
+        :return: list of the MD5 hash of each file, in the same order
+        """
+        md5hashes = []
+        with zipfile.ZipFile(self.msword_file, 'r') as zip_file:
+            for file_info in file_infos:
+                with zip_file.open(file_info) as xml_file:
+                    # hashes the file in chunks as it is decompressed, rather than reading it all in memory first
+                    md5hashes.append(hashlib.file_digest(xml_file, "md5").hexdigest())
+        return md5hashes
+
+    def xml_crcs(self):
+        """
+        :return: A dictionary in the following format:
+        {XML filename: (file size, CRC-32)}
+        The values are read from the central directory of the archive, so nothing is decompressed or hashed. Use it
+        to tell if files are the same when an MD5 hash isn't needed. Use xml_files() for the MD5 hashes.
+        """
+        with zipfile.ZipFile(self.msword_file, 'r') as zip_file:
+            return {file_info.filename: (file_info.file_size, file_info.CRC) for file_info in zip_file.infolist()}
+
+    def xml_exists(self, xmlfile):
+        """
+        :param xmlfile:
+        :return: True if the specified XML file is in the archive. Unlike xml_files(), it doesn't read or hash anything.
+        """
+        return xmlfile in self._namelist
 
     def xml_hash(self, xmlfile):
         """
         :param xmlfile:
         :return: the hash of a specified XML file
         """
-        return self.xml_files()[xmlfile][1]
+        return self.xml_files()[xmlfile].md5
 
     def xml_size(self, xmlfile):
         """
         :param xmlfile:
         :return: the size of a specified XML file
         """
-        return self.xml_files()[xmlfile][0]
+        return self.xml_files()[xmlfile].size
 
     def title(self):
         """
         :return: the title metadata in core.xml
         """
-        doc_title = re.search(r'<.{0,2}:?title>(.*?)</.{0,2}:?title>', self.core_xml_content)
-        return "" if doc_title is None else doc_title.group(1)
+        return self.core_metadata.get("title", "")
 
     def subject(self):
         """
         :return: the subject metadata from core.xml
         """
-        doc_subject = re.search(r'<.{0,2}:?subject>(.*?)</.{0,2}:?subject>', self.core_xml_content)
-        return "" if doc_subject is None else doc_subject.group(1)
+        return self.core_metadata.get("subject", "")
 
     def creator(self):
         """
         :return: the creator metadata from core.xml
         """
-        doc_creator = re.search(r'<.{0,2}:?creator>(.*?)</.{0,2}:?creator>', self.core_xml_content)
-        return "" if doc_creator is None else doc_creator.group(1)
+        return self.core_metadata.get("creator", "")
 
     def keywords(self):
         """
         :return: the keywords metadata from core.xml
         """
-        doc_keywords = re.search(r'<.{0,2}:?keywords>(.*?)</.{0,2}:?keywords>', self.core_xml_content)
-        return "" if doc_keywords is None else doc_keywords.group(1)
+        return self.core_metadata.get("keywords", "")
 
     def description(self):
         """
         :return: the description metadata from core.xml
         """
-        doc_description = re.search(r'<.{0,2}:?description>(.*?)</.{0,2}:?description>', self.core_xml_content)
-        return "" if doc_description is None else doc_description.group(1)
+        return self.core_metadata.get("description", "")
 
     def revision(self):
         """
         :return: the revision # metadata from core.xml
         """
-        doc_revision = re.search(r'<.{0,2}:?revision>(.*?)</.{0,2}:?revision>', self.core_xml_content)
-        return "" if doc_revision is None else doc_revision.group(1)
+        return self.core_metadata.get("revision", "")
 
     def created(self):
         """
         :return: the created date metadata from core.xml
         """
-        doc_created = re.search(r'<dcterms:created[^>].*?>(.*?)</dcterms:created>', self.core_xml_content)
-        return "" if doc_created is None else doc_created.group(1)
+        return self.core_metadata.get("created", "")
 
     def modified(self):
         """
         :return: the modified date metadata from core.xml
         """
-        doc_modified = re.search(r'<dcterms:modified[^>].*?>(.*?)</dcterms:modified>', self.core_xml_content)
-        return "" if doc_modified is None else doc_modified.group(1)
+        return self.core_metadata.get("modified", "")
 
     def last_modified_by(self):
         """
         :return: the last modified by metadata from core.xml
         """
-        doc_lastmodifiedby = re.search(r'<.{0,2}:?lastModifiedBy>(.*?)</.{0,2}:?lastModifiedBy>', self.core_xml_content)
-        return "" if doc_lastmodifiedby is None else doc_lastmodifiedby.group(1)
+        return self.core_metadata.get("lastModifiedBy", "")
 
     def last_printed(self):
         """
         :return: the last printed date metadata from core.xml
         """
-        doc_lastprinted = re.search(r'<.{0,2}:?lastPrinted>(.*?)</.{0,2}:?lastPrinted>', self.core_xml_content)
-        return "" if doc_lastprinted is None else doc_lastprinted.group(1)
+        return self.core_metadata.get("lastPrinted", "")
 
     def category(self):
         """
         :return: the category metadata from core.xml
         """
-        doc_category = re.search(r'<.{0,2}:?category>(.*?)</.{0,2}:?category>', self.core_xml_content)
-        return "" if doc_category is None else doc_category.group(1)
+        return self.core_metadata.get("category", "")
 
     def content_status(self):
         """
         :return: the content status metadata from core.xml
         """
-        doc_contentstatus = re.search(r'<.{0,2}:?contentStatus>(.*?)</.{0,2}:?contentStatus>', self.core_xml_content)
-        return "" if doc_contentstatus is None else doc_contentstatus.group(1)
+        return self.core_metadata.get("contentStatus", "")
 
     def template(self):
         """
         :return: the template metadata from app.xml
         """
-        doc_template = re.search(r'<.{0,2}:?Template>(.*?)</.{0,2}:?Template>', self.app_xml_content)
-        return "" if doc_template is None else doc_template.group(1)
+        return self.app_metadata.get("Template", "")
 
     def total_editing_time(self):
         """
         :return: the total editing time in minutes metadata from app.xml
         """
-        doc_edit_time = re.search(r'<.{0,2}:?TotalTime>(.*?)</.{0,2}:?TotalTime>', self.app_xml_content)
-        return "" if doc_edit_time is None else doc_edit_time.group(1)
+        return self.app_metadata.get("TotalTime", "")
 
     def pages(self):
         """
@@ -473,43 +490,37 @@ class Docx:
         It is not an error in the script. It's an error in the metadata. Opening the document and allowing it to
         fully load and then saving it updates this. But of course, it changes other metadata as well if you do that.
         """
-        doc_pages = re.search(r'<.{0,2}:?Pages>(.*?)</.{0,2}:?Pages>', self.app_xml_content)
-        return "" if doc_pages is None else doc_pages.group(1)
+        return self.app_metadata.get("Pages", "")
 
     def words(self):
         """
         :return: the number of words in the document metadata from app.xml
         """
-        doc_words = re.search(r'<.{0,2}:?Words>(.*?)</.{0,2}:?Words>', self.app_xml_content)
-        return "" if doc_words is None else doc_words.group(1)
+        return self.app_metadata.get("Words", "")
 
     def characters(self):
         """
         :return: the number of characters in the document metadata from app.xml
         """
-        doc_characters = re.search(r'<.{0,2}:?Characters>(.*?)</.{0,2}:?Characters>', self.app_xml_content)
-        return "" if doc_characters is None else doc_characters.group(1)
+        return self.app_metadata.get("Characters", "")
 
     def application(self):
         """
         :return: the application name that created the document metadata from app.xml
         """
-        doc_application = re.search(r'<.{0,2}:?Application>(.*?)</.{0,2}:?Application>', self.app_xml_content)
-        return "" if doc_application is None else doc_application.group(1)
+        return self.app_metadata.get("Application", "")
 
     def security(self):
         """
         :return: the security metadata from app.xml
         """
-        doc_security = re.search(r'<.{0,2}:?DocSecurity>(.*?)</.{0,2}:?DocSecurity>', self.app_xml_content)
-        return "" if doc_security is None else doc_security.group(1)
+        return self.app_metadata.get("DocSecurity", "")
 
     def lines(self):
         """
         :return: the number of lines in the document metadata from app.xml
         """
-        doc_lines = re.search(r'<.{0,2}:?Lines>(.*?)</.{0,2}:?Lines>', self.app_xml_content)
-        return "" if doc_lines is None else doc_lines.group(1)
+        return self.app_metadata.get("Lines", "")
 
     def paragraphs(self):
         """
@@ -518,61 +529,55 @@ class Docx:
         the metadata for some reason. It's not an error in this program. It's an error with the metadata itself
         in the document.
         """
-        doc_paragraphs = re.search(r'<.{0,2}:?Paragraphs>(.*?)</.{0,2}:?Paragraphs>', self.app_xml_content)
-        return "" if doc_paragraphs is None else doc_paragraphs.group(1)
+        return self.app_metadata.get("Paragraphs", "")
 
     def characters_with_spaces(self):
         """
         :return: the total characters including spaces in the document metadatafrom app.xml
         """
-        doc_characters_with_spaces = re.search(
-            r'<.{0,2}:?CharactersWithSpaces>(.*?)</.{0,2}:?CharactersWithSpaces>', self.app_xml_content)
-        return "" if doc_characters_with_spaces is None else doc_characters_with_spaces.group(1)
+        return self.app_metadata.get("CharactersWithSpaces", "")
 
     def app_version(self):
         """
         :return: the version of the app that created the document metadatafrom app.xml
         """
-        doc_app_version = re.search(r'<.{0,2}:?AppVersion>(.*?)</.{0,2}:?AppVersion>', self.app_xml_content)
-        return "" if doc_app_version is None else doc_app_version.group(1)
+        return self.app_metadata.get("AppVersion", "")
 
     def manager(self):
         """
         :return: the manager metadata from app.xml
         """
-        doc_manager = re.search(r'<.{0,2}:?Manager>(.*?)</.{0,2}:?Manager>', self.app_xml_content)
-        return "" if doc_manager is None else doc_manager.group(1)
+        return self.app_metadata.get("Manager", "")
 
     def company(self):
         """
         :return: the company metadata from app.xml
         """
-        doc_company = re.search(r'<.{0,2}:?Company>(.*?)</.{0,2}:?Company>', self.app_xml_content)
-        return "" if doc_company is None else doc_company.group(1)
+        return self.app_metadata.get("Company", "")
 
     def paragraph_tags(self):
         """
         :return: the total number of paragraph tags in document.xml
         """
-        return len(self.p_tags)
+        return self.tag_counts["p"]
 
     def runs_tags(self):
         """
         :return: the total number of runs tags in document.xml
         """
-        return len(self.r_tags)
+        return self.tag_counts["r"]
 
     def text_tags(self):
         """
         :return: the total number of text tags in document.xml
         """
-        return len(self.t_tags)
+        return self.tag_counts["t"]
 
     def rsid_root(self):
         """
         :return: rsidRoot from settings.xml
         """
-        root = re.search(r'<w:rsidRoot w:val="([^"]*)"', self.settings_xml_content)
+        root = _RSID_ROOT_RE.search(self.settings_xml_content)
         return "" if root is None else root.group(1)
 
     def rsidr(self):
@@ -627,10 +632,11 @@ class Docx:
         This can be edited to suit your needs. You can naturally accomplish the same results by calling each of
         the methods in your print statement in the main script.
         """
-        if self.last_printed() == "":
+        last_printed = self.last_printed()
+        if last_printed == "":
             printed = f'Document was never printed'
         else:
-            printed = f'Printed: {self.last_printed()}'
+            printed = f'Printed: {last_printed}'
         return (f'Document: {self.filename()}\n'
                 f'Created by: {self.creator()}\n'
                 f'Created date: {self.created()}\n'
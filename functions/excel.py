@@ -21,8 +21,9 @@ def write_worksheet(excel_filepath, worksheet_name, headers, rows_of_data):
     try:
         if os.path.exists(excel_filepath):  # if the file exists, open it.
             workbook = load_workbook(excel_filepath)
-        else:  # otherwise, create it
-            workbook = Workbook()
+        else:  # otherwise, create it. Write-only, the rows are streamed to the file when it is saved rather than
+            # kept as cells in memory. It also doesn't have a default sheet.
+            workbook = Workbook(write_only=True)
 
         if worksheet_name in workbook.sheetnames:  # if the worksheet metadata already exists, select it.
             worksheet = workbook[worksheet_name]
@@ -1,5 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
+from tkinter import font as tkfont
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import os
 import time
 
 # Variables for log files
@@ -7,18 +11,61 @@ timestamp = time.strftime("%Y%m%d_%H%M%S")
 log_file = "DOCx_Parser_Log_" + timestamp + ".log"
 error_log_file = "DOCx_Error_Log_" + timestamp + ".log"
 
+# Worker threads for the menu's background work while the user is still making their selections: building the text
+# of the file list rows.
+menu_executor = ThreadPoolExecutor(max_workers=4)
+
+
+@dataclass(frozen=True)
+class MenuSelection:
+    """
+    The choices made in the main menu, as returned by docx_menu().
+    The DOCx file paths are kept in the tuple returned by the file dialog rather than copied into a list.
+    Use files() to go through them one at a time and n_files for how many there are.
+    """
+    clicked_button: str  # "PROCESS", "CANCEL", or "" if the window was closed
+    log_file: str
+    error_log_file: str
+    processing_option: str  # "triage" or "full"
+    hash_files: bool
+    excel_file: str
+    docx_paths: tuple
+
+    @property
+    def n_files(self):
+        """
+        :return: the number of DOCx files selected
+        """
+        return len(self.docx_paths)
+
+    def files(self):
+        """
+        :return: a generator over the selected DOCx file paths
+        """
+        yield from self.docx_paths
+
+
 def docx_menu():
     # Create the main application window (the parent window)
     root = tk.Tk()
     root.title("MS Word Parsing")
 
-    # Define some style settings
+    # Define some style settings. They are built into one theme (based on the platform's default theme) and applied
+    # once, rather than restyling the widgets after each individual setting.
+    # The fonts are created once as named fonts and shared by all the widgets, so Tk resolves them a single time.
+    text_font = tkfont.Font(root, family="Arial", size=10)
+    bold_font = tkfont.Font(root, family="Arial", size=12, weight="bold")
+
     style = ttk.Style()
-    style.configure("TFrame", background="#f0f0f0")
-    style.configure("TLabel", background="#f0f0f0", font=("Arial", 10))
-    style.configure("TButton", background="#d0d0d0", font=("Arial", 10))
-    style.configure("TRadiobutton", background="#f0f0f0", font=("Arial", 10))
-    style.configure("TCheckbutton", background="#f0f0f0", font=("Arial", 10))
+    style.theme_create("msword", parent=style.theme_use(), settings={
+        "TFrame": {"configure": {"background": "#f0f0f0"}},
+        "TLabel": {"configure": {"background": "#f0f0f0", "font": text_font}},
+        "TButton": {"configure": {"background": "#d0d0d0", "font": text_font}},
+        "TRadiobutton": {"configure": {"background": "#f0f0f0", "font": text_font}},
+        "TCheckbutton": {"configure": {"background": "#f0f0f0", "font": text_font}},
+        "Treeview": {"configure": {"font": text_font, "rowheight": text_font.metrics("linespace") + 4}}
+    })
+    style.theme_use("msword")
 
     # Create a frame for the parent menu with padding and background color
     parent_frame = ttk.Frame(root, padding="10", style="TFrame")
@@ -34,10 +81,11 @@ def docx_menu():
 
     # Variables to be updated and returned
     excel_file = None
-    docx_files = []
+    docx_files = ()
     radio_option = None
     hash_files = False
     clicked_button = ""
+    rows_future = None  # file row texts being built for the latest selection
 
     # Create a StringVar to hold the selected radio button value
     radio_var = tk.StringVar(value="triage")
@@ -57,11 +105,6 @@ def docx_menu():
     hash_checkbox = ttk.Checkbutton(parsing_frame, text="Hash files", variable=hash_var, style="TCheckbutton")
     hash_checkbox.grid(row=1, column=0, columnspan=2, sticky="W", padx=5, pady=5)
 
-    # Bind the radio buttons and checkbox to the print function
-    triage_radio.config()
-    full_radio.config()
-    hash_checkbox.config()
-
     # Create the second child frame within the parent frame for Excel output file selection
     file_frame = ttk.LabelFrame(parent_frame, text="Excel Output File", padding="10")
     file_frame.grid(row=2, column=0, sticky="W", pady=10)
@@ -114,57 +157,68 @@ def docx_menu():
     docx_frame = ttk.LabelFrame(parent_frame, text="DOCx File Selection", padding="10")
     docx_frame.grid(row=1, column=1, rowspan=3, sticky="NSEW", padx=10, pady=10)
 
-    # Create a canvas and scrollbar for the scrollable area
-    canvas = tk.Canvas(docx_frame, width=800, height=200, bg="#ffffff")  # Increased width to reduce wrapping
-    canvas.grid(row=1, column=0, sticky="NSEW")
+    # Create a list and scrollbar for the selected DOCx files. The Treeview only draws the rows that are visible, so
+    # it can list thousands of files.
+    files_view = ttk.Treeview(docx_frame, columns=("path",), show="headings", height=10)
+    files_view.heading("path", text="DOCx", anchor="w")
+    files_view.column("path", width=800, anchor="w")  # Increased width to reduce wrapping
+    files_view.grid(row=1, column=0, sticky="NSEW")
 
-    scrollbar = ttk.Scrollbar(docx_frame, orient="vertical", command=canvas.yview)
+    scrollbar = ttk.Scrollbar(docx_frame, orient="vertical", command=files_view.yview)
     scrollbar.grid(row=1, column=1, sticky="NS")
-
-    # Create a frame to contain the text inside the canvas
-    scrollable_frame = ttk.Frame(canvas, padding="5")
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-
-    # Update the scrollbar and canvas when the size of the content changes
-    def on_frame_configure(event):
-        canvas.configure(scrollregion=canvas.bbox("all"))
-
-    scrollable_frame.bind("<Configure>", on_frame_configure)
+    files_view.configure(yscrollcommand=scrollbar.set)
 
     # Create a label to show the number of selected DOCx files
-    num_files_label = ttk.Label(docx_frame, text="No files selected", foreground="blue", font=("Arial", 12, "bold"))
+    num_files_label = ttk.Label(docx_frame, text="No files selected", foreground="blue", font=bold_font)
     num_files_label.grid(row=0, column=0, sticky="W", padx=5, pady=5)
 
+    # Function to build the text of the file rows. It runs in a worker thread so the strings are ready by the time
+    # the menu gets to display them.
+    def file_row_texts(paths):
+        return [os.path.normpath(p) for p in paths]  # display paths with the platform's separators
+
+    # Function to replace the list of selected files with the rows built in the background
+    def show_file_rows(future):
+        if future is not rows_future:  # another selection was made since this one
+            return
+        if not future.done():  # check again shortly
+            root.after(50, show_file_rows, future)
+            return
+
+        files_view.delete(*files_view.get_children())
+        root.after_idle(insert_file_rows, future, 0)
+
+    # Function to add the rows to the list in batches when the menu is idle, so it stays responsive for large
+    # selections.
+    def insert_file_rows(future, start):
+        if future is not rows_future:  # another selection was made since this one
+            return
+        texts = future.result()
+        for text in texts[start:start + 500]:
+            files_view.insert("", "end", values=(text,))
+        if start + 500 < len(texts):
+            root.after_idle(insert_file_rows, future, start + 500)
+
     # Function to open a file dialog to select one or more DOCx files
     def select_docx_files():
-        nonlocal docx_files
+        nonlocal docx_files, rows_future
         file_paths = filedialog.askopenfilenames(
             title="Select DOCx Files",
             filetypes=(("Word documents", "*.docx"), ("All files", "*.*"))
         )
         if file_paths:
-            docx_files = list(file_paths)
+            docx_files = tuple(file_paths)
             num_files_label.config(text=f"{len(docx_files)} file(s) selected", foreground="green")
 
-            for widget in scrollable_frame.winfo_children():
-                widget.destroy()
-
-            if len(docx_files) < 1001:  # if too many files, it causes a problem to display them.
-                for file in docx_files:
-                    file_label = ttk.Label(scrollable_frame, text=file, wraplength=780, anchor="w",
-                                           justify="left")  # Adjusted wraplength
-                    file_label.pack(fill="x", pady=2)
-            else:
-                file_label = ttk.Label(scrollable_frame, text="Too many files to list...", wraplength=780, anchor="w",
-                                       justify="left")
-                file_label.pack(fill="x", pady=2)
+            rows_future = menu_executor.submit(file_row_texts, docx_files)
+            root.after(0, show_file_rows, rows_future)
             update_process_button_state()
 
     # Add a button to select DOCx files
     select_docx_button = ttk.Button(docx_frame, text="Select DOCx Files", command=select_docx_files, style="TButton")
     select_docx_button.grid(row=2, column=0, sticky="W", pady=5, padx=5)
 
-    # Configure grid weight for the frame and canvas
+    # Configure grid weight for the frame and file list
     docx_frame.grid_columnconfigure(0, weight=1)
     docx_frame.grid_rowconfigure(1, weight=1)
 
@@ -174,15 +228,17 @@ def docx_menu():
         radio_option = radio_var.get()
         hash_files = hash_var.get()
         clicked_button = button.cget('text')
+        # Unlink the selected file label from its variable so the Tcl variable isn't kept alive by the widget
+        selected_file_label.configure(textvariable="")
         # Exit the application
         root.destroy()
 
     # Create and place "PROCESS" and "CANCEL" buttons at the bottom of the main frame
-    process_button = tk.Button(parent_frame, text="PROCESS", bg="grey", fg="white", font=("Arial", 12, "bold"),
+    process_button = tk.Button(parent_frame, text="PROCESS", bg="grey", fg="white", font=bold_font,
                                width=20, state="disabled", command=lambda: button_clicked(process_button))
     process_button.grid(row=4, column=0, padx=5, pady=10, sticky="EW")
 
-    cancel_button = tk.Button(parent_frame, text="CANCEL", bg="red", fg="white", font=("Arial", 12, "bold"), width=20,
+    cancel_button = tk.Button(parent_frame, text="CANCEL", bg="red", fg="white", font=bold_font, width=20,
                               command=lambda: button_clicked(cancel_button))
     cancel_button.grid(row=4, column=1, padx=5, pady=10, sticky="E")
 
@@ -203,5 +259,11 @@ def docx_menu():
     # Start the Tkinter event loop
     root.mainloop()
 
-    return clicked_button, log_file, error_log_file, radio_option, hash_files, excel_file, docx_files
+    # Release the Tk variables now that their values have been read. Deleting them unsets their Tcl variables right
+    # away instead of leaving it to garbage collection (see bpo-34794).
+    del radio_var, hash_var, selected_file_var
+
+    return MenuSelection(clicked_button=clicked_button, log_file=log_file, error_log_file=error_log_file,
+                         processing_option=radio_option, hash_files=hash_files, excel_file=excel_file,
+                         docx_paths=docx_files)
 